@@ -1,39 +1,74 @@
+import argparse
 import os
 import pathlib
-import subprocess
-import sys
-import time # Kept for potential future use, though not critical now
+import stat
 
 SCRATCH_DIR_NAME = "scratch-pad"
 INTERMEDIATE_SOURCE_FILE_NAME = "file_to_markdown_source.md"
 AIDER_BATCH_FILE_NAME = "run-aider.bat"
+AIDER_PROMPT = (
+    "Please convert the entire content of this file into well-formatted markdown. "
+    "Replace the existing content of this file with *only* the generated markdown. "
+    "Do not add any conversational text, commentary, introductions, or summaries."
+)
 
-def get_source_content() -> str:
+# Resolved once at import; neither changes while the script runs
+_SCRIPT_DIR = pathlib.Path(__file__).resolve().parent
+_CWD = pathlib.Path.cwd()
+
+def validate_source_path(user_input: str) -> pathlib.Path | None:
+    """
+    Checks that user_input names an existing regular file.
+    Returns the path, or None after printing why it was rejected; callers decide whether to re-prompt.
+    """
+    if not user_input:
+        print("Error: File path cannot be empty.")
+        return None
+    if "\x00" in user_input:
+        print("Error: File path cannot contain NUL characters.")
+        return None
+
+    # A single os.stat() tells us both whether the path exists and what kind it is,
+    # without building a Path object for inputs that get rejected
+    try:
+        st = os.stat(user_input)
+    except FileNotFoundError:
+        print(f"Error: File not found at '{user_input}'.")
+        return None
+    except OSError as e:
+        print(f"Error: Cannot access '{user_input}': {e.strerror or e}.")
+        return None
+
+    if stat.S_ISREG(st.st_mode):
+        print(f"Reading content from file: {user_input}")
+        return pathlib.Path(user_input)
+    elif stat.S_ISDIR(st.st_mode):
+        print(f"Error: '{user_input}' is a directory, not a file.")
+    else:
+        print(f"Error: '{user_input}' is not a regular file.")
+    return None
+
+def get_source_content() -> pathlib.Path | None:
     """
     Prompts the user for the full path to a source file.
-    Ensures the file exists and reads its content.
-    Returns the content as a string, or an empty string if aborted.
+    Ensures the path names an existing regular file; the content itself is left for Aider to read.
+    Returns the path, or None if aborted.
     """
     while True:
         try:
             user_input = input("Please enter the full path to the file you want to convert: ").strip()
-            if not user_input:
-                print("File path cannot be empty. Please try again or Ctrl+C to exit.")
-                continue
-
-            input_path = pathlib.Path(user_input)
-
-            if input_path.is_file():
-                print(f"Reading content from file: {input_path}")
+            input_path = validate_source_path(user_input)
+            if input_path:
                 return input_path
-            elif input_path.exists():
-                print(f"Error: '{input_path}' is a directory, not a file. Please provide a path to a file.")
-            else:
-                print(f"Error: File not found at '{input_path}'. Please check the path and try again.")
+            print("Please try again or Ctrl+C to exit.")
         
         except KeyboardInterrupt:
             print("\nFile input aborted by user.")
-            return "" # Return empty to signal abortion
+            return None # Signal abortion
+        except EOFError:
+            # stdin is redirected and exhausted (e.g. `python main.py < path.txt`); re-prompting would loop forever
+            print("\nNo more input. File input aborted.")
+            return None
         except Exception as e:
             print(f"An error occurred: {e}. Please try again.")
             # Loop again
@@ -48,19 +83,42 @@ def prepare_intermediate_source_file(content: str) -> pathlib.Path:
     print(f"Source content written to: {intermediate_file_path}")
     return intermediate_file_path
 
+def locate_batch_file() -> str | None:
+    """
+    Returns the absolute path to the Aider batch file, or None if it cannot be found.
+    The copy next to this script wins; otherwise PATH is searched once with shutil.which.
+    """
+    import shutil
+
+    bundled_batch_file = _SCRIPT_DIR / AIDER_BATCH_FILE_NAME
+    if bundled_batch_file.is_file():
+        return str(bundled_batch_file)
+    return shutil.which(AIDER_BATCH_FILE_NAME)
+
+def parse_args() -> argparse.Namespace:
+    """Parses the optional command line flags; anything omitted falls back to the interactive prompts."""
+    parser = argparse.ArgumentParser(description="Convert a file's content to markdown in place using Aider.")
+    parser.add_argument("--input", help="Path to the file to convert. Prompted for when omitted.")
+    parser.add_argument("--prompt", help="Prompt sent to Aider. Defaults to the built-in markdown conversion prompt.")
+    return parser.parse_args()
+
 def main():
     """Main script logic."""
+    args = parse_args()
     print("--- Starting File to Markdown Conversion Setup ---")
     #  Print current working directory
-    print(f"Current working directory: {pathlib.Path.cwd()}")
+    print(f"Current working directory: {_CWD}")
     # Print directory this python file lives in
-    print(f"Script directory: {pathlib.Path(__file__).parent}")
+    print(f"Script directory: {_SCRIPT_DIR}")
     try:
-        source_content = get_source_content()
-        if not source_content: # Handles empty string from aborted get_source_content
+        if args.input is not None:
+            # Path given on the command line: validate it once instead of entering the prompt loop
+            source_path = validate_source_path(args.input.strip())
+        else:
+            source_path = get_source_content()
+        if source_path is None: # Rejected --input or aborted get_source_content
             print("No source file provided. Exiting.")
             return
-        file_to_update = source_content
 
     except KeyboardInterrupt:
         print("\nOperation cancelled during setup. Exiting.")
@@ -69,45 +127,43 @@ def main():
         print(f"Error during setup: {e}. Exiting.")
         return
 
-    print(f"\n--- Setup Complete ---\nFile To Update: {file_to_update}")
+    print(f"\n--- Setup Complete ---\nFile To Update: {source_path}")
     print("\n--- Processing with Aider via Batch File ---")
 
-    aider_prompt = (
-        "Please convert the entire content of this file into well-formatted markdown. "
-        "Replace the existing content of this file with *only* the generated markdown. "
-        "Do not add any conversational text, commentary, introductions, or summaries."
-    )
+    aider_prompt = args.prompt or AIDER_PROMPT
 
-    batch_file_path = pathlib.Path(__file__).parent / AIDER_BATCH_FILE_NAME
-    # Check if batch file is in Current Working Directory, if not, it must be in PATH
-    if not (batch_file_path).is_file():
-        print(f"Error: Batch file '{AIDER_BATCH_FILE_NAME}' not found")
+    batch_file_path = locate_batch_file()
+    if not batch_file_path:
+        print(f"Error: Batch file '{AIDER_BATCH_FILE_NAME}' not found next to the script or in PATH")
         return
 
+    batch_command = [batch_file_path, str(source_path), aider_prompt]
 
-    batch_command = [batch_file_path, str(file_to_update), aider_prompt]
+    # Only needed once we actually launch Aider, so skip its import cost on early exits
+    import subprocess
 
     print(f"Running command: {batch_command}")
     try:
-        process = subprocess.run(
-            batch_command,
-            capture_output=False,
-            text=True,
-            check=True, # Raises CalledProcessError for non-zero exit codes
-            encoding="utf-8",
-            shell=False # Recommended for security with list args
-        )
+        # stdout/stderr are inherited from this console, so a bare Popen + wait() is all that is needed
+        with subprocess.Popen(batch_command, shell=False) as process: # shell=False recommended for security with list args
+            try:
+                returncode = process.wait()
+            except BaseException:
+                process.kill() # Don't leave Aider running if we are interrupted
+                raise
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, batch_command)
         print("Batch file executed successfully.")
-        print(f"Aider converted '{file_to_update}' with markdown formatting.")
+        print(f"Aider converted '{source_path}' with markdown formatting.")
         print("--- Conversion Complete ---")
 
     except subprocess.CalledProcessError as e:
+        # Output is not captured; the batch file's stdout/stderr were already shown above
         print(f"\nBatch file failed (exit code {e.returncode}). Command: {e.cmd}")
-        print(f"Stdout:\n{e.stdout if e.stdout else '[No standard output]'}")
-        print(f"Stderr:\n{e.stderr if e.stderr else '[No standard error]'}")
-        print(f"\n'{file_to_update}' might contain partial results.")
+        print(f"\n'{source_path}' might contain partial results.")
     except FileNotFoundError: # This means the batch_command[0] was not found by the OS
-        print(f"\nError: Command '{batch_command[0]}' not found. Ensure '{AIDER_BATCH_FILE_NAME}' is in CWD or PATH and executable.")
+        print(f"\nError: Command '{batch_command[0]}' not found. "
+              f"Ensure '{AIDER_BATCH_FILE_NAME}' is next to the script or in PATH and executable.")
     except KeyboardInterrupt:
         print("\nOperation cancelled during Aider processing.")
     except Exception as e: